@@ -0,0 +1,53 @@
+"""Content-hash markers recording which PDFs have been fully converted."""
+
+import hashlib
+from pathlib import Path
+
+# Directory inside the output directory holding <sha256>.done markers for fully converted PDFs.
+CACHE_DIR_NAME = ".cache"
+
+
+def cache_marker_path(pdf_path: Path, output_dir: Path) -> Path:
+    """Locate the conversion marker of a PDF, named after the SHA-256 of its content.
+
+    Args:
+        pdf_path (Path): Source PDF file.
+        output_dir (Path): Directory the PDF's pages are written to.
+
+    Returns:
+        Path: Marker file inside ``output_dir/.cache``; it exists only if the PDF was fully converted before.
+
+    Raises:
+        OSError: If the PDF cannot be read.
+    """
+    with open(pdf_path, "rb") as fh:
+        return output_dir / CACHE_DIR_NAME / f"{hashlib.file_digest(fh, 'sha256').hexdigest()}.done"
+
+
+def read_cache_marker(marker: Path) -> int | None:
+    """Read the page count stored in a conversion marker.
+
+    Args:
+        marker (Path): Marker file written after a PDF was fully converted.
+
+    Returns:
+        int | None: Page count of the converted PDF, or None if there is no readable marker.
+    """
+    try:
+        return int(marker.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache_marker(marker: Path, page_count: int) -> None:
+    """Record a PDF as fully converted.
+
+    Args:
+        marker (Path): Marker file returned by cache_marker_path.
+        page_count (int): Number of pages of the converted PDF.
+
+    Raises:
+        OSError: If the marker cannot be written.
+    """
+    marker.parent.mkdir(exist_ok=True)
+    marker.write_text(str(page_count), encoding="utf-8")
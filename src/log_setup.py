@@ -0,0 +1,65 @@
+"""Buffered file logging shared by the CLI process and its pool workers."""
+
+import io
+import logging
+from pathlib import Path
+
+# Reason: the log format uses none of these record fields, so skip collecting them for every record.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches records in a large write buffer instead of flushing after each one.
+
+    Records reach the file when the buffer fills, on flush(), or on close() (run by logging.shutdown at exit).
+    """
+
+    buffer_size = 64 * 1024
+
+    def _open(self) -> io.TextIOWrapper:
+        """Open the log file with a buffer of buffer_size bytes."""
+        return open(
+            self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding, errors=self.errors
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record to the buffered stream without flushing it."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(output_dir: Path, log_level: str = "INFO", log_to_console: bool = False) -> None:
+    """Configure logging for the CLI.
+
+    Args:
+        output_dir (Path): Directory where the log file will be written.
+        log_level (str): Logging level (e.g., 'INFO', 'DEBUG').
+        log_to_console (bool): If True, also log to the console.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log_file = output_dir / "app.log"
+    handlers: list[logging.Handler] = [BufferedFileHandler(log_file, mode="a", encoding="utf-8")]
+    if log_to_console:
+        handlers.append(logging.StreamHandler())
+    root_logger = logging.getLogger()
+    # Remove all handlers associated with the root logger object (avoid duplicate logs if reconfigured)
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    logging.basicConfig(
+        level=getattr(logging, log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=handlers,
+    )
+
+
+def flush_log_handlers() -> None:
+    """Flush every handler attached to the root logger."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
@@ -1,21 +1,46 @@
 """PDF to PNG batch converter CLI.
 
-Reads PDF files from an input directory, converts each page to PNG, and writes them to an output directory.
+Reads PDF files from an input directory, converts each page to PNG (or JPEG), and writes them to an output directory.
 
 Usage:
-    python main.py --input-dir ./data --output-dir ./output
+    python -m src.main --input-dir ./data --output-dir ./output
 """
 
-import argparse
 import logging
 import os
 import sys
+import tempfile
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from functools import partial
 from pathlib import Path
 
-from pdf2image import convert_from_path  # type: ignore
+from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
 from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError
 from PIL import Image
 
+from .cache_markers import cache_marker_path, read_cache_marker, write_cache_marker
+from .log_setup import configure_logging, flush_log_handlers
+from .options import (
+    DEFAULT_DPI,
+    DEFAULT_PREFETCH,
+    DEFAULT_THREADS_PER_PDF,
+    DEFAULT_WINDOW,
+    OUTPUT_EXTENSIONS,
+    PAGES_PER_RENDER_PROCESS,
+    available_cpus,
+    parse_args,
+)
+from .page_output import discard_page, save_page
+from .render_ahead import drain, render_ahead
+
+_LOG = logging.getLogger(__name__)
+
+# pdftoppm -jpegopt settings: quality 85 is visually lossless for scans at a fraction of the PNG size.
+JPEG_OPTIONS = {"quality": 85, "progressive": True, "optimize": True}
+
 
 class PdfConversionError(RuntimeError):
     """Raised when PDF to PNG conversion fails."""
@@ -25,115 +50,211 @@ class PdfConversionError(RuntimeError):
 
 def get_logger() -> logging.Logger:
     """Get a module-level logger."""
-    return logging.getLogger(__name__)
+    return _LOG
 
 
-def configure_logging(output_dir: Path, log_level: str = "INFO", log_to_console: bool = False) -> None:
-    """Configure logging for the CLI.
+def _page_name(pdf_path: Path, page: int, extension: str) -> str:
+    """Build the output file name of one page.
 
     Args:
-        output_dir (Path): Directory where the log file will be written.
-        log_level (str): Logging level (e.g., 'INFO', 'DEBUG').
-        log_to_console (bool): If True, also log to the console.
+        pdf_path (Path): Source PDF file.
+        page (int): 1-based page number.
+        extension (str): File extension including the dot.
+
+    Returns:
+        str: File name of the page image.
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-    log_file = output_dir / "app.log"
-    handlers: list[logging.Handler] = [logging.FileHandler(log_file, mode="a", encoding="utf-8")]
-    if log_to_console:
-        handlers.append(logging.StreamHandler())
-    root_logger = logging.getLogger()
-    # Remove all handlers associated with the root logger object (avoid duplicate logs if reconfigured)
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper(), logging.INFO),
-        format="%(asctime)s %(levelname)s %(message)s",
-        handlers=handlers,
-    )
+    return f"{pdf_path.stem}_page_{page}{extension}"
 
 
-def parse_args(args: list[str] | None = None) -> argparse.Namespace:
-    """Parse command-line arguments.
+def _render_pages(
+    pdf_path: Path,
+    render_dir: Path,
+    first_page: int,
+    last_page: int,
+    thread_count: int,
+    compress_level: int | None,
+    fmt: str,
+    dpi: int,
+) -> list[str] | list[Image.Image]:
+    """Rasterize a range of pages with poppler.
 
     Args:
-        args (list[str] | None): List of CLI arguments or None for sys.argv.
+        pdf_path (Path): Path to the PDF file.
+        render_dir (Path): Scratch directory poppler writes page files to when it encodes them itself.
+        first_page (int): First page to render (1-based, inclusive).
+        last_page (int): Last page to render (inclusive).
+        thread_count (int): Number of poppler processes the pages are split across.
+        compress_level (int | None): zlib level for encoding PNGs in-process, or None to let poppler write them.
+        fmt (str): Output format, a key of OUTPUT_EXTENSIONS.
+        dpi (int): Rendering resolution.
 
     Returns:
-        argparse.Namespace: Parsed arguments with input_dir, output_dir, log_level, and log_to_console.
+        list[str] | list[Image.Image]: Paths of the page files written by poppler, or decoded page images when
+            they are encoded in-process.
+
+    Raises:
+        PdfConversionError: If poppler fails to render the pages.
     """
-    parser = argparse.ArgumentParser(
-        description="Convert PDF pages to PNG images.",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    parser.add_argument(
-        "--input-dir",
-        type=Path,
-        default=Path(__file__).parent.parent / "data",
-        help="Directory containing PDF files.",
-    )
-    parser.add_argument(
-        "--output-dir",
-        type=Path,
-        default=Path(__file__).parent.parent / "output",
-        help="Directory to save PNG images.",
-    )
-    parser.add_argument(
-        "--log-level",
-        type=str,
-        default="INFO",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-        help="Set the logging level.",
-    )
-    parser.add_argument(
-        "--log-to-console",
-        action="store_true",
-        help="Enable logging to console in addition to file.",
-    )
-    parser.add_argument(
-        "--overwrite",
-        action="store_true",
-        help="Overwrite existing PNG files.",
-    )
-    return parser.parse_args(args)
+    try:
+        if fmt != "png" or compress_level is None:
+            # Reason: poppler writes the final images itself, so pages are never decoded or re-encoded in Python.
+            return convert_from_path(
+                str(pdf_path),
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page,
+                thread_count=thread_count,
+                fmt=fmt,
+                jpegopt=JPEG_OPTIONS if fmt == "jpeg" else None,
+                output_folder=str(render_dir),
+                paths_only=True,
+            )
+        # Reason: poppler has no zlib level knob, so pages come back as uncompressed PPM to be encoded in-process.
+        return convert_from_path(
+            str(pdf_path), dpi=dpi, first_page=first_page, last_page=last_page, thread_count=thread_count
+        )
+    except (PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError) as e:
+        _LOG.error("Failed to convert %s: %s", pdf_path, e)
+        raise PdfConversionError(f"PDF conversion failed for {pdf_path}") from e
 
 
-def pdf_to_pngs(pdf_path: Path, output_dir: Path, overwrite: bool = False) -> list[Path]:
-    """Convert a PDF file to PNG images, one per page.
+def pdf_to_pngs(
+    pdf_path: Path,
+    output_dir: Path,
+    overwrite: bool = False,
+    thread_count: int = DEFAULT_THREADS_PER_PDF,
+    compress_level: int | None = None,
+    fmt: str = "png",
+    window: int | None = None,
+    dpi: int = DEFAULT_DPI,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> list[Path]:
+    """Convert a PDF file to PNG (or JPEG) images, one per page.
+
+    Pages are rendered and saved in windows of at most ``window`` pages. A background thread renders up to
+    ``prefetch`` windows ahead while the current one is saved, so rasterization overlaps disk I/O and encoding.
+    Rendering happens in a private scratch directory (under ``$XDG_RUNTIME_DIR`` when set, usually a tmpfs),
+    and each finished page is published into ``output_dir`` with a single rename. Once every page is on disk, a
+    marker named after the PDF's SHA-256 is written to ``output_dir/.cache`` so unchanged PDFs are skipped later.
 
     Args:
         pdf_path (Path): Path to the PDF file.
         output_dir (Path): Directory to save PNG images.
         overwrite (bool): Whether to overwrite existing PNGs.
+        thread_count (int): Number of poppler processes the pages are split across.
+        compress_level (int | None): zlib level for encoding PNGs in-process, or None to let poppler write them.
+        fmt (str): Output format, a key of OUTPUT_EXTENSIONS.
+        window (int | None): Maximum number of pages rendered per poppler call, or None for
+            PAGES_PER_RENDER_PROCESS pages per thread (at least DEFAULT_WINDOW).
+        dpi (int): Rendering resolution.
+        prefetch (int): Windows rendered ahead of the one being saved; 0 renders each window only when needed.
 
     Returns:
-        list[Path]: List of output PNG file paths.
+        list[Path]: Paths of the images written by this call; pages skipped because they exist are not included.
 
     Raises:
         PdfConversionError: If PDF conversion fails.
     """
-    logger = get_logger()
+    extension = OUTPUT_EXTENSIONS[fmt]
+    # Reason: one directory listing replaces a stat per page, which adds up on network filesystems.
+    existing: set[str] = set() if overwrite else {entry.name for entry in os.scandir(output_dir)}
+    try:
+        marker = cache_marker_path(pdf_path, output_dir)
+    except OSError as e:
+        _LOG.error("Cannot read %s: %s", pdf_path, e)
+        raise PdfConversionError(f"Cannot read {pdf_path}") from e
+    # Reason: a marker left by an earlier run of identical content records the page count, so an unchanged,
+    # fully converted PDF is skipped without starting poppler at all.
+    cached_page_count = None if overwrite else read_cache_marker(marker)
+    if cached_page_count is not None and all(
+        _page_name(pdf_path, i, extension) in existing for i in range(1, cached_page_count + 1)
+    ):
+        _LOG.info("%s is unchanged and already converted; skipping", pdf_path.name)
+        return []
+
     try:
-        images: list[Image.Image] = convert_from_path(str(pdf_path))
+        page_count: int = pdfinfo_from_path(str(pdf_path))["Pages"]
     except (PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError) as e:
-        logger.error(f"Failed to convert {pdf_path}: {e}")
+        _LOG.error("Failed to convert %s: %s", pdf_path, e)
         raise PdfConversionError(f"PDF conversion failed for {pdf_path}") from e
 
+    windows: list[tuple[int, int, list[str]]] = []
+    if window is None:
+        # Reason: every window costs a pdfinfo plus one pdftoppm per thread, each re-parsing the PDF, so small
+        # windows on many threads would start hundreds of processes that render about one page each.
+        window = max(DEFAULT_WINDOW, PAGES_PER_RENDER_PROCESS * thread_count)
+    for first_page in range(1, page_count + 1, window):
+        last_page = min(first_page + window - 1, page_count)
+        names = [_page_name(pdf_path, i, extension) for i in range(first_page, last_page + 1)]
+        # Reason: re-runs skip rasterizing windows whose pages are all on disk already.
+        if not all(name in existing for name in names):
+            windows.append((first_page, last_page, names))
+
     output_paths: list[Path] = []
-    for i, img in enumerate(images, start=1):
-        output_path = output_dir / f"{pdf_path.stem}_page_{i}.png"
-        if output_path.exists() and not overwrite:
-            logger.info(f"Skipping existing file: {output_path}")
-            continue
-        try:
-            img.save(output_path, "PNG")
-            output_paths.append(output_path)
-            logger.info(f"Saved {output_path}")
-        except OSError as e:
-            logger.error(f"Failed to save {output_path}: {e}")
-            raise PdfConversionError(f"Failed to save {output_path}") from e
+    with tempfile.TemporaryDirectory(prefix="pdf-to-png-", dir=os.environ.get("XDG_RUNTIME_DIR")) as tmp:
+        render_dir = Path(tmp)
+        rendered = render_ahead(
+            lambda first, last: _render_pages(
+                pdf_path, render_dir, first, last, thread_count, compress_level, fmt, dpi
+            ),
+            [(first_page, last_page) for first_page, last_page, _ in windows],
+            prefetch,
+        )
+        # Reason: closing() joins the render thread before the scratch directory is removed, even on errors.
+        with closing(rendered):
+            for (first_page, last_page, names), pages in zip(windows, rendered, strict=True):
+                # Reason: pages are named by position and pdf2image ignores pdftoppm's exit status, so a short
+                # result would otherwise shift pages onto the wrong numbers.
+                if len(pages) != len(names):
+                    _LOG.error(
+                        "poppler returned %d of %d pages (%d-%d) for %s",
+                        len(pages),
+                        len(names),
+                        first_page,
+                        last_page,
+                        pdf_path,
+                    )
+                    raise PdfConversionError(f"PDF conversion failed for {pdf_path}")
+                for name, page in zip(names, drain(pages), strict=True):
+                    output_path = output_dir / name
+                    try:
+                        if name in existing:
+                            _LOG.debug("Skipping existing file: %s", output_path)
+                            discard_page(page)
+                            continue
+                        save_page(page, output_path, render_dir, compress_level)
+                        existing.add(name)
+                        output_paths.append(output_path)
+                        _LOG.debug("Saved %s", output_path)
+                    except OSError as e:
+                        _LOG.error("Failed to save %s: %s", output_path, e)
+                        raise PdfConversionError(f"Failed to save {output_path}") from e
+    _LOG.info("Saved %d of %d pages from %s", len(output_paths), page_count, pdf_path.name)
+    try:
+        write_cache_marker(marker, page_count)
+    except OSError as e:
+        _LOG.warning("Could not record %s as converted: %s", pdf_path.name, e)
     return output_paths
 
 
+def _convert_in_worker(convert: Callable[[Path], list[Path]], pdf_path: Path) -> list[Path]:
+    """Run one conversion inside a pool worker, then flush its buffered log records.
+
+    Args:
+        convert (Callable[[Path], list[Path]]): Conversion function with all options bound.
+        pdf_path (Path): Path to the PDF file.
+
+    Returns:
+        list[Path]: Output image paths returned by convert.
+    """
+    try:
+        return convert(pdf_path)
+    finally:
+        # Reason: pool workers exit via os._exit, which skips atexit and therefore logging.shutdown.
+        flush_log_handlers()
+
+
 def main(args: list[str] | None = None) -> int:
     """Main entry point for the CLI.
 
@@ -145,34 +266,99 @@ def main(args: list[str] | None = None) -> int:
     """
     parsed = parse_args(args)
     configure_logging(parsed.output_dir, parsed.log_level, parsed.log_to_console)
-    logger = get_logger()
     input_dir: Path = parsed.input_dir
     output_dir: Path = parsed.output_dir
 
-    if not input_dir.is_dir():
-        logger.error(f"Input directory does not exist: {input_dir}")
+    # Reason: listing the input directory doubles as the existence check, saving a separate stat per run. scandir
+    # reuses the directory entry's type instead of a stat per file, and the suffix check is case-insensitive so
+    # files such as REPORT.PDF are not silently skipped.
+    try:
+        with os.scandir(input_dir) as entries:
+            pdf_files = sorted(
+                Path(entry.path) for entry in entries if entry.is_file() and entry.name.lower().endswith(".pdf")
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        _LOG.error("Input directory does not exist: %s", input_dir)
+        return 1
+    except OSError as e:
+        _LOG.error("Cannot read input directory %s: %s", input_dir, e)
         return 1
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
     except Exception as e:
-        logger.error(f"Cannot create output directory {output_dir}: {e}")
+        _LOG.error("Cannot create output directory %s: %s", output_dir, e)
         return 1
-    if not os.access(str(output_dir), os.W_OK):
-        logger.error(f"Output directory is not writable: {output_dir}")
+    # Reason: actually creating a file is the only reliable writability test; os.access is advisory on NFS.
+    try:
+        with tempfile.TemporaryFile(dir=output_dir):
+            pass
+    except OSError:
+        _LOG.error("Output directory is not writable: %s", output_dir)
         return 1
 
-    pdf_files = list(input_dir.glob("*.pdf"))
     if not pdf_files:
-        logger.warning(f"No PDF files found in {input_dir}")
+        _LOG.warning("No PDF files found in %s", input_dir)
         return 0
 
     exit_code = 0
+    # Reason: output names are built from the stem, so a.pdf and a.PDF would write, skip or mix each other's pages.
+    stem_counts = Counter(pdf_file.stem for pdf_file in pdf_files)
     for pdf_file in pdf_files:
-        try:
-            pdf_to_pngs(pdf_file, output_dir, overwrite=parsed.overwrite)
-        except PdfConversionError as e:
-            logger.error(e)
+        if stem_counts[pdf_file.stem] > 1:
+            _LOG.error("Skipping %s: another input PDF has the same name stem %r", pdf_file, pdf_file.stem)
             exit_code = 1
+    pdf_files = [pdf_file for pdf_file in pdf_files if stem_counts[pdf_file.stem] == 1]
+    if not pdf_files:
+        return exit_code
+
+    workers = min(parsed.workers, len(pdf_files))
+    cpus = available_cpus()
+    # Reason: derive the default after clamping workers to the PDF count, so a small batch still uses every core.
+    threads_per_pdf = parsed.threads_per_pdf or max(1, cpus // workers)
+    if workers * threads_per_pdf > cpus:
+        # Reason: more poppler processes than usable CPUs only adds contention, so keep workers x threads <= CPUs.
+        workers = min(workers, cpus)
+        threads_per_pdf = max(1, cpus // workers)
+        _LOG.warning("Capping to %d workers x %d threads per PDF for %d available CPUs", workers, threads_per_pdf, cpus)
+
+    convert = partial(
+        pdf_to_pngs,
+        output_dir=output_dir,
+        overwrite=parsed.overwrite,
+        thread_count=threads_per_pdf,
+        compress_level=parsed.png_compress_level,
+        fmt=parsed.format,
+        window=parsed.window,
+        dpi=parsed.dpi,
+        prefetch=parsed.prefetch,
+    )
+    if workers == 1:
+        # Reason: a pool of one only adds process start-up and pickling overhead.
+        for pdf_file in pdf_files:
+            try:
+                convert(pdf_file)
+            except PdfConversionError as e:
+                _LOG.error(e)
+                exit_code = 1
+        return exit_code
+
+    # Reason: rasterization is CPU-bound in poppler, so PDFs scale across processes rather than threads.
+    # Workers reconfigure logging on start-up so they append to the same app.log as the parent.
+    # Reason: forked workers inherit the parent's unflushed log buffer and would write it out again when they
+    # replace the inherited handler, so empty it before any worker is created.
+    flush_log_handlers()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_logging,
+        initargs=(output_dir, parsed.log_level, parsed.log_to_console),
+    ) as executor:
+        futures = {executor.submit(_convert_in_worker, convert, pdf_file): pdf_file for pdf_file in pdf_files}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except PdfConversionError as e:
+                _LOG.error(e)
+                exit_code = 1
     return exit_code
 
 
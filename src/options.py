@@ -0,0 +1,217 @@
+"""Command-line options of the converter and their defaults."""
+
+import argparse
+import os
+from pathlib import Path
+
+from .page_output import UNFILTERED_PNG_MAX_LEVEL
+
+# cgroup v2 CPU quota ("<quota> <period>" or "max <period>") of the current container, if any.
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus() -> int:
+    """Count the CPUs this process may actually run on.
+
+    Unlike os.cpu_count(), this honours the CPU affinity mask and a cgroup v2 CPU quota, both of which are
+    commonly set for containers.
+
+    Returns:
+        int: Number of usable CPUs (at least 1).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Reason: sched_getaffinity is Linux-only.
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+DEFAULT_WORKERS = min(available_cpus(), 4)
+# Reason: share the remaining cores between the PDFs converted in parallel so workers x threads ~ CPU count.
+DEFAULT_THREADS_PER_PDF = max(1, available_cpus() // DEFAULT_WORKERS)
+# File extension written for each supported --format value.
+OUTPUT_EXTENSIONS = {"png": ".png", "jpeg": ".jpg"}
+# Windows rendered ahead of the one being saved; one already hides rendering behind saving.
+DEFAULT_PREFETCH = 1
+# Rasterization resolution; pixel count, encode time and file size all grow with its square.
+DEFAULT_DPI = 150
+# Minimum pages rendered per poppler call; bounds how many decoded pages are held in memory at once.
+DEFAULT_WINDOW = 8
+# Pages each pdftoppm process renders per window by default. pdf2image runs pdfinfo and starts one pdftoppm per
+# thread for every window, each re-parsing the PDF, so the default window grows with --threads-per-pdf.
+PAGES_PER_RENDER_PROCESS = 4
+
+
+def positive_int(value: str) -> int:
+    """Argparse type that accepts only integers >= 1.
+
+    Args:
+        value (str): Raw CLI value.
+
+    Returns:
+        int: Parsed integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from e
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Argparse type that accepts only integers >= 0.
+
+    Args:
+        value (str): Raw CLI value.
+
+    Returns:
+        int: Parsed integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a non-negative integer.
+    """
+    try:
+        number = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from e
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {number}")
+    return number
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        args (list[str] | None): List of CLI arguments or None for sys.argv.
+
+    Returns:
+        argparse.Namespace: Parsed arguments with input_dir, output_dir, log_level, log_to_console, overwrite,
+            workers, threads_per_pdf, format, png_compress_level, dpi, window, and prefetch.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert PDF pages to PNG images.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=Path(__file__).parent.parent / "data",
+        help="Directory containing PDF files.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(__file__).parent.parent / "output",
+        help="Directory to save PNG images.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Set the logging level.",
+    )
+    parser.add_argument(
+        "--log-to-console",
+        action="store_true",
+        help="Enable logging to console in addition to file.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Overwrite existing PNG files.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "Number of PDFs converted in parallel (separate processes). "
+            "Capped so that workers x threads per PDF does not exceed the available CPUs."
+        ),
+    )
+    parser.add_argument(
+        "--threads-per-pdf",
+        type=positive_int,
+        default=None,
+        help=(
+            "Number of poppler processes rendering the pages of a single PDF. "
+            "Defaults to the available CPUs divided by the number of workers actually used."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="png",
+        choices=sorted(OUTPUT_EXTENSIONS),
+        help="Output image format. JPEG (quality 85) is much smaller and faster to write for scanned PDFs.",
+    )
+    parser.add_argument(
+        "--png-compress-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="{0-9}",
+        help=(
+            "Encode pages in-process at this zlib level instead of letting poppler write them. "
+            f"Levels 0-{UNFILTERED_PNG_MAX_LEVEL} leave rows unfiltered: several times faster to save, but files are "
+            "often two to three times larger on text pages. Higher levels use Pillow's filtering encoder; "
+            "9 is smallest and slowest."
+        ),
+    )
+    parser.add_argument(
+        "--fast",
+        dest="png_compress_level",
+        action="store_const",
+        const=0,
+        help=(
+            "Write uncompressed (zlib level 0) PNGs: still valid PNGs, but several times larger. "
+            "Shorthand for --png-compress-level 0, intended for intermediate output such as OCR input."
+        ),
+    )
+    parser.add_argument(
+        "--dpi",
+        type=positive_int,
+        default=DEFAULT_DPI,
+        help=(
+            "Rendering resolution. Cost and file size scale with its square (200 -> 150 DPI is ~44%% fewer pixels). "
+            "Use 300 for OCR, which is the resolution most OCR engines are tuned for."
+        ),
+    )
+    parser.add_argument(
+        "--window",
+        type=positive_int,
+        default=None,
+        help=(
+            "Pages rendered per poppler call, split across --threads-per-pdf pdftoppm processes that each re-parse "
+            f"the PDF. Defaults to {PAGES_PER_RENDER_PROCESS} pages per thread, at least {DEFAULT_WINDOW}. "
+            "Up to window x (prefetch + 2) pages are held in memory per PDF (queued, being rendered and being "
+            "saved), so lower values cap memory use on large PDFs; higher values start fewer poppler processes."
+        ),
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=non_negative_int,
+        default=DEFAULT_PREFETCH,
+        help=(
+            "Windows rendered in the background while the previous one is saved, overlapping rasterization with "
+            "disk writes. Each extra window holds another --window pages in memory; 0 disables the overlap."
+        ),
+    )
+    parsed = parser.parse_args(args)
+    if parsed.format != "png" and parsed.png_compress_level is not None:
+        parser.error("--png-compress-level/--fast only apply to --format png")
+    return parsed
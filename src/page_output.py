@@ -0,0 +1,97 @@
+"""Writing rendered pages to their final location in the output directory."""
+
+import errno
+import os
+import shutil
+import struct
+import zlib
+from pathlib import Path
+
+from PIL import Image
+
+# PNG colour type and samples per pixel for the 8-bit Pillow modes written by write_unfiltered_png.
+PNG_COLOR_TYPES = {"L": (0, 1), "LA": (4, 2), "RGB": (2, 3), "RGBA": (6, 4)}
+# Highest --png-compress-level written with unfiltered rows; above it, size matters more than speed, so Pillow's
+# filtering encoder is used.
+UNFILTERED_PNG_MAX_LEVEL = 5
+
+
+def write_unfiltered_png(image: Image.Image, path: Path, compress_level: int | None) -> None:
+    """Encode an image as a PNG whose scanlines all use filter type 0 (None).
+
+    Pillow's encoder tries every PNG filter on every row to pick the most compressible one, which costs more than
+    the zlib pass itself at low compression levels. Writing unfiltered rows straight into zlib skips that search,
+    but the output is larger: two to three times Pillow's size is common for text pages. Levels above
+    UNFILTERED_PNG_MAX_LEVEL therefore keep Pillow's filtering encoder.
+
+    Args:
+        image (Image.Image): Page image; modes other than L, LA, RGB and RGBA are saved with Pillow instead.
+        path (Path): Destination file.
+        compress_level (int | None): zlib level (0-9), or None for zlib's default.
+    """
+    level = zlib.Z_DEFAULT_COMPRESSION if compress_level is None else compress_level
+    if image.mode not in PNG_COLOR_TYPES or not 0 <= level <= UNFILTERED_PNG_MAX_LEVEL:
+        image.save(path, "PNG", compress_level=level, optimize=False)
+        return
+    color_type, channels = PNG_COLOR_TYPES[image.mode]
+    width, height = image.size
+    stride = width * channels
+    pixels = memoryview(image.tobytes())
+    compressor = zlib.compressobj(level)
+    idat = []
+    for offset in range(0, height * stride, stride):
+        idat.append(compressor.compress(b"\x00"))
+        idat.append(compressor.compress(pixels[offset : offset + stride]))
+    idat.append(compressor.flush())
+
+    with open(path, "wb") as fh:
+        fh.write(b"\x89PNG\r\n\x1a\n")
+        for chunk_type, data in (
+            (b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+            (b"IDAT", b"".join(idat)),
+            (b"IEND", b""),
+        ):
+            fh.write(struct.pack(">I", len(data)) + chunk_type)
+            fh.write(data)
+            fh.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+def save_page(page: str | Image.Image, output_path: Path, render_dir: Path, compress_level: int | None) -> None:
+    """Publish one rendered page at its final location with a single rename.
+
+    Args:
+        page (str | Image.Image): Path of a page file written by poppler, or a decoded page image.
+        output_path (Path): Final image path.
+        render_dir (Path): Scratch directory decoded page images are encoded into before being published.
+        compress_level (int | None): zlib level used when encoding a decoded page image.
+    """
+    if not isinstance(page, str):
+        rendered = render_dir / output_path.name
+        write_unfiltered_png(page, rendered, compress_level)
+        page = str(rendered)
+    try:
+        os.replace(page, output_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Reason: across filesystems, copy next to the destination first so the final rename stays atomic.
+        partial_path = output_path.with_name(f".{output_path.name}.partial")
+        try:
+            shutil.copyfile(page, partial_path)
+            os.replace(partial_path, output_path)
+        except OSError:
+            # Reason: this is the usual path when the scratch dir is a tmpfs, so a copy cut short by a full disk
+            # must not leave a truncated hidden file behind in the output directory.
+            partial_path.unlink(missing_ok=True)
+            raise
+        os.remove(page)
+
+
+def discard_page(page: str | Image.Image) -> None:
+    """Remove a page file written by poppler; decoded images need no cleanup.
+
+    Args:
+        page (str | Image.Image): Page returned by convert_from_path.
+    """
+    if isinstance(page, str):
+        Path(page).unlink(missing_ok=True)
@@ -0,0 +1,82 @@
+"""Streaming rendered page windows from poppler to the code that saves them."""
+
+import queue
+import threading
+from collections.abc import Callable, Generator, Iterator
+from contextlib import suppress
+from typing import TypeVar, cast
+
+T = TypeVar("T")
+
+
+def drain(items: list[T]) -> Iterator[T]:
+    """Yield the items of a list in order while removing them from it.
+
+    The list no longer references an item once it has been yielded, so a decoded page image is freed as soon as the
+    caller moves on to the next one instead of when the whole window is done.
+
+    Args:
+        items (list[T]): List to consume; it is empty once the iterator is exhausted.
+
+    Yields:
+        T: The next item.
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
+def render_ahead(
+    render: Callable[[int, int], T], page_ranges: list[tuple[int, int]], prefetch: int
+) -> Generator[T, None, None]:
+    """Render page ranges in order on a background thread, staying at most ``prefetch`` results ahead.
+
+    poppler runs as a subprocess and zlib releases the GIL, so a plain thread is enough to overlap rendering of
+    the next window with saving of the current one. Close the generator (e.g. with contextlib.closing) to stop
+    early; closing waits for the thread so nothing is written after the caller has moved on.
+
+    Args:
+        render (Callable[[int, int], T]): Renders one (first_page, last_page) range.
+        page_ranges (list[tuple[int, int]]): Ranges to render, in output order.
+        prefetch (int): Maximum number of rendered ranges waiting to be consumed; 0 renders on demand.
+
+    Yields:
+        T: The rendered result of each range, in order.
+
+    Raises:
+        Exception: Whatever ``render`` raised, re-raised in the consuming thread.
+    """
+    if prefetch == 0:
+        for first_page, last_page in page_ranges:
+            yield render(first_page, last_page)
+        return
+
+    results: queue.Queue[object] = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+
+    def produce() -> None:
+        try:
+            for first_page, last_page in page_ranges:
+                if stop.is_set():
+                    return
+                results.put(render(first_page, last_page))
+        except Exception as e:
+            results.put(e)
+            return
+        results.put(done)
+
+    thread = threading.Thread(target=produce, name="pdf-render", daemon=True)
+    thread.start()
+    try:
+        while (item := results.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield cast(T, item)
+    finally:
+        stop.set()
+        # Reason: keep draining so a producer blocked on a full queue can finish its current range and exit.
+        while thread.is_alive():
+            with suppress(queue.Empty):
+                results.get(timeout=0.05)
+        thread.join()
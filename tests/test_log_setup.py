@@ -0,0 +1,25 @@
+"""Unit tests for the buffered log file setup."""
+
+import logging
+from pathlib import Path
+
+import src.log_setup as log_setup_mod
+
+
+def test_buffered_file_handler_batches_writes(tmp_path: Path) -> None:
+    """Test log records stay buffered until the handler is flushed."""
+    log_file = tmp_path / "app.log"
+    handler = log_setup_mod.BufferedFileHandler(log_file, mode="a", encoding="utf-8")
+    handler.emit(logging.makeLogRecord({"msg": "hello"}))
+    assert log_file.read_text() == ""
+    handler.flush()
+    assert log_file.read_text() == "hello\n"
+    handler.close()
+
+
+def test_configure_logging_closes_replaced_handlers(tmp_path: Path) -> None:
+    """Test reconfiguring logging flushes records held by the previous buffered handler."""
+    log_setup_mod.configure_logging(tmp_path)
+    logging.getLogger(__name__).warning("first run")
+    log_setup_mod.configure_logging(tmp_path)
+    assert "first run" in (tmp_path / "app.log").read_text()
@@ -1,15 +1,21 @@
 """Unit tests for PDF to PNG batch converter CLI."""
 
+import errno
+import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
 import src.main as main_mod
+import src.options as options_mod
+from src.cache_markers import CACHE_DIR_NAME
 
-PDF_SYNTAX_ERROR = getattr(main_mod, "PDFSyntaxError", None)
-PDF_CONVERSION_ERROR = getattr(main_mod, "PdfConversionError", RuntimeError)
+PDF_SYNTAX_ERROR = main_mod.PDFSyntaxError
+PDF_CONVERSION_ERROR = main_mod.PdfConversionError
 
 
 @pytest.fixture
@@ -20,41 +26,265 @@ def sample_pdf(tmp_path: Path) -> Path:
     return pdf_path
 
 
-def test_parse_args_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Test parse_args uses default directories when not specified."""
-    test_args = ["main.py"]
-    monkeypatch.setattr(sys, "argv", test_args)
-    args = main_mod.parse_args()
-    assert args.input_dir.name == "data"
-    assert args.output_dir.name == "output"
+@pytest.fixture
+def poppler(tmp_path: Path) -> Iterator[mock.Mock]:
+    """Patch pdf2image with a fake poppler that renders ``page_count`` pages (default 2).
+
+    In paths_only mode each page is written to ``output_folder`` as ``rendered-NN.png`` containing ``page N``;
+    otherwise mock images are returned and collected in ``images``.
+    """
+    fake = mock.Mock(page_count=2, images=[])
+
+    def render(
+        pdf_path: str,
+        first_page: int = 1,
+        last_page: int | None = None,
+        output_folder: str | None = None,
+        paths_only: bool = False,
+        **kwargs: object,
+    ) -> list[object]:
+        pages = range(first_page, (last_page or fake.page_count) + 1)
+        if not paths_only:
+            images = [mock.Mock() for _ in pages]
+            for image in images:
+                image.save.side_effect = lambda path, *a, **k: Path(path).write_bytes(b"encoded")
+            fake.images.extend(images)
+            return images
+        paths = []
+        for page in pages:
+            path = Path(str(output_folder)) / f"rendered-{page:02d}.png"
+            path.write_bytes(f"page {page}".encode())
+            paths.append(str(path))
+        return paths
 
+    with (
+        mock.patch("src.main.pdfinfo_from_path", side_effect=lambda *a, **k: {"Pages": fake.page_count}) as info,
+        mock.patch("src.main.convert_from_path", side_effect=render) as convert,
+    ):
+        fake.info = info
+        fake.convert = convert
+        yield fake
 
-def test_pdf_to_pngs_success(tmp_path: Path, sample_pdf: Path) -> None:
+
+def test_pdf_to_pngs_success(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
     """Test successful PDF to PNG conversion."""
-    # Mock convert_from_path to return a list of mock images
-    with mock.patch("src.main.convert_from_path") as mock_convert:
-        mock_img = mock.Mock()
-        mock_convert.return_value = [mock_img, mock_img]
-        output_dir = tmp_path / "out"
-        output_dir.mkdir()
-        result = main_mod.pdf_to_pngs(sample_pdf, output_dir)
-        assert len(result) == 2
-        for path in result:
-            assert path.parent == output_dir
-        assert mock_img.save.call_count == 2
-
-
-def test_pdf_to_pngs_failure(tmp_path: Path, sample_pdf: Path) -> None:
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    result = main_mod.pdf_to_pngs(sample_pdf, output_dir)
+    assert result == [output_dir / "test_page_1.png", output_dir / "test_page_2.png"]
+    assert result[1].read_bytes() == b"page 2"
+    assert sorted(p.name for p in output_dir.glob("*.png")) == ["test_page_1.png", "test_page_2.png"]
+    kwargs = poppler.convert.call_args.kwargs
+    assert kwargs["thread_count"] == main_mod.DEFAULT_THREADS_PER_PDF
+    assert kwargs["fmt"] == "png"
+    assert kwargs["paths_only"] is True
+
+
+def test_pdf_to_pngs_skips_existing(
+    tmp_path: Path, sample_pdf: Path, poppler: mock.Mock, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test existing pages are kept unless overwrite is set, without leaving rendered files behind."""
+    (tmp_path / "test_page_1.png").write_bytes(b"old")
+    with caplog.at_level("INFO", logger="src.main"):
+        result = main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    assert caplog.messages == ["Saved 1 of 2 pages from test.pdf"]
+    assert result == [tmp_path / "test_page_2.png"]
+    assert (tmp_path / "test_page_1.png").read_bytes() == b"old"
+    assert not list(tmp_path.glob("rendered-*"))
+
+    result = main_mod.pdf_to_pngs(sample_pdf, tmp_path, overwrite=True)
+    assert len(result) == 2
+    assert (tmp_path / "test_page_1.png").read_bytes() == b"page 1"
+
+
+def test_pdf_to_pngs_skips_fully_converted_pdf(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test a PDF whose pages all exist is not rasterized again."""
+    for page in (1, 2):
+        (tmp_path / f"test_page_{page}.png").write_bytes(b"old")
+    assert main_mod.pdf_to_pngs(sample_pdf, tmp_path) == []
+    poppler.convert.assert_not_called()
+
+
+def test_pdf_to_pngs_skips_unchanged_pdf(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test a converted PDF with unchanged content is skipped without calling poppler."""
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    main_mod.pdf_to_pngs(sample_pdf, output_dir)
+    assert len(list((output_dir / CACHE_DIR_NAME).glob("*.done"))) == 1
+    poppler.info.reset_mock()
+    poppler.convert.reset_mock()
+
+    assert main_mod.pdf_to_pngs(sample_pdf, output_dir) == []
+    poppler.info.assert_not_called()
+
+    (output_dir / "test_page_2.png").unlink()
+    assert main_mod.pdf_to_pngs(sample_pdf, output_dir) == [output_dir / "test_page_2.png"]
+
+    sample_pdf.write_bytes(b"%PDF-1.4\n% edited\n%EOF\n")
+    poppler.info.reset_mock()
+    assert main_mod.pdf_to_pngs(sample_pdf, output_dir) == []
+    poppler.info.assert_called_once()
+    assert len(list((output_dir / CACHE_DIR_NAME).glob("*.done"))) == 2
+
+
+def test_pdf_to_pngs_renders_in_windows(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test pages are rendered in windows and fully converted windows are skipped."""
+    poppler.page_count = 7
+    (tmp_path / "test_page_1.png").write_bytes(b"old")
+    (tmp_path / "test_page_2.png").write_bytes(b"old")
+    result = main_mod.pdf_to_pngs(sample_pdf, tmp_path, window=2)
+    assert [p.name for p in result] == [f"test_page_{page}.png" for page in range(3, 8)]
+    windows = [(c.kwargs["first_page"], c.kwargs["last_page"]) for c in poppler.convert.call_args_list]
+    assert windows == [(3, 4), (5, 6), (7, 7)]
+
+
+def test_pdf_to_pngs_default_window_scales_with_threads(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test the default window gives every pdftoppm process several pages instead of starting one per page."""
+    poppler.page_count = 40
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path, thread_count=4)
+    ranges = [(call.kwargs["first_page"], call.kwargs["last_page"]) for call in poppler.convert.call_args_list]
+    assert ranges == [(1, 16), (17, 32), (33, 40)]
+    poppler.convert.reset_mock()
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path, thread_count=1, overwrite=True)
+    assert poppler.convert.call_count == 5  # never below DEFAULT_WINDOW pages
+
+
+def test_pdf_to_pngs_compress_level(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test a compress level switches to Pillow encoding with that zlib level."""
+    result = main_mod.pdf_to_pngs(sample_pdf, tmp_path, compress_level=1)
+    assert len(result) == 2
+    assert "paths_only" not in poppler.convert.call_args.kwargs
+    for image, path in zip(poppler.images, result, strict=True):
+        (saved_to, *args), kwargs = image.save.call_args
+        assert saved_to.name == path.name
+        assert args == ["PNG"]
+        assert kwargs == {"compress_level": 1, "optimize": False}
+        assert path.read_bytes() == b"encoded"
+
+
+def test_pdf_to_pngs_releases_saved_images(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test each decoded page is dropped from the rendered list once it has been saved."""
+    remaining: list[int] = []
+    original = poppler.convert.side_effect
+
+    def render(*args: object, **kwargs: object) -> list[object]:
+        pages = original(*args, **kwargs)
+        for image in pages:
+            image.save.side_effect = lambda path, *a, **k: (remaining.append(len(pages)), Path(path).write_bytes(b""))
+        return pages
+
+    poppler.convert.side_effect = render
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path, compress_level=1)
+    assert remaining == [1, 0]
+
+
+def test_pdf_to_pngs_jpeg(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test JPEG output is written by poppler with .jpg names."""
+    poppler.page_count = 1
+    result = main_mod.pdf_to_pngs(sample_pdf, tmp_path, fmt="jpeg")
+    assert result == [tmp_path / "test_page_1.jpg"]
+    kwargs = poppler.convert.call_args.kwargs
+    assert kwargs["fmt"] == "jpeg"
+    assert kwargs["jpegopt"] == main_mod.JPEG_OPTIONS
+
+
+def test_pdf_to_pngs_renders_in_scratch_dir(
+    tmp_path: Path, sample_pdf: Path, poppler: mock.Mock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test pages are rendered under $XDG_RUNTIME_DIR and the scratch directory is removed afterwards."""
+    runtime_dir = tmp_path / "run"
+    runtime_dir.mkdir()
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    main_mod.pdf_to_pngs(sample_pdf, output_dir)
+    assert Path(poppler.convert.call_args.kwargs["output_folder"]).parent == runtime_dir
+    assert not list(runtime_dir.iterdir())
+    assert sorted(p.name for p in output_dir.glob("*.png")) == ["test_page_1.png", "test_page_2.png"]
+
+
+def test_pdf_to_pngs_cross_device_move(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test pages are copied next to the destination and renamed when the scratch dir is on another filesystem."""
+    real_replace = os.replace
+
+    def replace(src: str, dst: Path) -> None:
+        if not Path(src).name.endswith(".partial"):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        real_replace(src, dst)
+
+    with mock.patch("src.main.os.replace", side_effect=replace):
+        result = main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    assert [p.read_bytes() for p in result] == [b"page 1", b"page 2"]
+    assert not list(tmp_path.glob(".*.partial"))
+
+
+def test_pdf_to_pngs_rename_failure(
+    tmp_path: Path, sample_pdf: Path, poppler: mock.Mock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a failed move raises and leaves no rendered pages behind."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    with (
+        mock.patch("src.main.os.replace", side_effect=OSError("disk full")),
+        pytest.raises(PDF_CONVERSION_ERROR),
+    ):
+        main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["test.pdf"]
+
+
+def test_pdf_to_pngs_thread_count(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test the per-PDF thread count is forwarded to pdf2image."""
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path, thread_count=3)
+    assert poppler.convert.call_args.kwargs["thread_count"] == 3
+
+
+def test_pdf_to_pngs_dpi(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test the rendering resolution defaults to DEFAULT_DPI and is forwarded to pdf2image."""
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    assert poppler.convert.call_args.kwargs["dpi"] == main_mod.DEFAULT_DPI
+    main_mod.pdf_to_pngs(sample_pdf, tmp_path, overwrite=True, compress_level=1, dpi=300)
+    assert poppler.convert.call_args.kwargs["dpi"] == 300
+
+
+def test_pdf_to_pngs_failure(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
     """Test PDF to PNG conversion raises on error."""
-    if PDF_SYNTAX_ERROR is not None:
-        with mock.patch("src.main.convert_from_path", side_effect=PDF_SYNTAX_ERROR("bad pdf")):
-            with pytest.raises(PDF_CONVERSION_ERROR):
-                main_mod.pdf_to_pngs(sample_pdf, tmp_path)
-    else:
-        # Fallback for environments where PDFSyntaxError is not available
-        with mock.patch("src.main.convert_from_path", side_effect=Exception("bad pdf")):
-            with pytest.raises(PDF_CONVERSION_ERROR):
-                main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    poppler.convert.side_effect = PDF_SYNTAX_ERROR("bad pdf")
+    with pytest.raises(PDF_CONVERSION_ERROR):
+        main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+
+
+def test_pdf_to_pngs_unreadable_pdf(tmp_path: Path, poppler: mock.Mock) -> None:
+    """Test a PDF that cannot be opened raises PdfConversionError instead of a raw OSError."""
+    with pytest.raises(PDF_CONVERSION_ERROR, match="Cannot read"):
+        main_mod.pdf_to_pngs(tmp_path / "missing.pdf", tmp_path)
+    poppler.info.assert_not_called()
+
+
+def test_main_unreadable_pdf_fails_run(tmp_path: Path) -> None:
+    """Test an unreadable PDF fails that PDF with exit code 1 rather than crashing main."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"%PDF-1.4\n%EOF\n")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output"), "--workers", "1"]
+    with mock.patch("src.main.cache_marker_path", side_effect=PermissionError("denied")):
+        assert main_mod.main(args) == 1
+
+
+def test_pdf_to_pngs_short_render(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test a window that comes back with missing pages raises instead of renumbering or marking the PDF done."""
+    original = poppler.convert.side_effect
+    poppler.convert.side_effect = lambda *args, **kwargs: original(*args, **kwargs)[:-1]
+    with pytest.raises(PDF_CONVERSION_ERROR):
+        main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    assert not list(tmp_path.glob("test_page_*.png"))
+    assert not (tmp_path / CACHE_DIR_NAME).exists()
+
+
+def test_pdf_to_pngs_page_count_failure(tmp_path: Path, sample_pdf: Path, poppler: mock.Mock) -> None:
+    """Test a PDF whose page count cannot be read raises."""
+    poppler.info.side_effect = PDF_SYNTAX_ERROR("bad pdf")
+    with pytest.raises(PDF_CONVERSION_ERROR):
+        main_mod.pdf_to_pngs(sample_pdf, tmp_path)
+    poppler.convert.assert_not_called()
 
 
 def test_main_no_pdfs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -73,3 +303,156 @@ def test_main_invalid_input_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     output_dir = tmp_path / "output"
     monkeypatch.setattr(sys, "argv", ["main.py", "--input-dir", str(input_dir), "--output-dir", str(output_dir)])
     assert main_mod.main() == 1
+
+
+def test_main_input_path_is_a_file(tmp_path: Path, sample_pdf: Path) -> None:
+    """Test main exits with error if the input path is not a directory."""
+    assert main_mod.main(["--input-dir", str(sample_pdf), "--output-dir", str(tmp_path / "output")]) == 1
+
+
+def test_main_unwritable_output_dir(tmp_path: Path) -> None:
+    """Test main exits with error if a file cannot be created in the output directory."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"%PDF-1.4\n%EOF\n")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output")]
+    with (
+        mock.patch("src.main.tempfile.TemporaryFile", side_effect=PermissionError("read-only")),
+        mock.patch("src.main.pdf_to_pngs") as mock_convert,
+    ):
+        assert main_mod.main(args) == 1
+    mock_convert.assert_not_called()
+
+
+def test_main_converts_in_parallel(tmp_path: Path) -> None:
+    """Test main dispatches every PDF to the pool and reports failures."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (input_dir / name).write_bytes(b"%PDF-1.4\n%EOF\n")
+    output_dir = tmp_path / "output"
+
+    def fake_convert(pdf_path: Path, *args: object, **kwargs: object) -> list[Path]:
+        if pdf_path.name == "b.pdf":
+            raise PDF_CONVERSION_ERROR(f"PDF conversion failed for {pdf_path}")
+        return []
+
+    # Reason: threads share the patched module, whereas worker processes would not.
+    with (
+        mock.patch("src.main.ProcessPoolExecutor", ThreadPoolExecutor),
+        mock.patch("src.main.pdf_to_pngs", side_effect=fake_convert) as mock_convert,
+    ):
+        code = main_mod.main(["--input-dir", str(input_dir), "--output-dir", str(output_dir), "--workers", "2"])
+    assert code == 1
+    assert sorted(call.args[0].name for call in mock_convert.call_args_list) == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_main_process_pool_logs_each_record_once(tmp_path: Path) -> None:
+    """Test pool workers do not re-write log records the parent buffered before forking them."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        (input_dir / name).write_bytes(b"%PDF-1.4\n%EOF\n")
+    output_dir = tmp_path / "output"
+    args = ["--input-dir", str(input_dir), "--output-dir", str(output_dir), "--workers", "2", "--threads-per-pdf", "2"]
+    # Reason: a real pool is used; forked workers inherit the patched pdfinfo, spawned ones fail without poppler.
+    with (
+        mock.patch("src.main.available_cpus", return_value=2),
+        mock.patch("src.main.pdfinfo_from_path", side_effect=PDF_SYNTAX_ERROR("bad pdf")),
+    ):
+        assert main_mod.main(args) == 1
+    main_mod.configure_logging(output_dir)  # closes, and so flushes, the parent's handler
+    log = (output_dir / "app.log").read_text(encoding="utf-8")
+    assert log.count("Capping to 2 workers x 1 threads per PDF") == 1
+    assert log.count("PDF conversion failed for") == 2
+
+
+def test_main_single_worker_runs_inline(tmp_path: Path) -> None:
+    """Test main skips the process pool when only one worker is requested."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"%PDF-1.4\n%EOF\n")
+    output_dir = tmp_path / "output"
+    with (
+        mock.patch("src.main.ProcessPoolExecutor") as mock_pool,
+        mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert,
+    ):
+        code = main_mod.main(["--input-dir", str(input_dir), "--output-dir", str(output_dir), "--workers", "1"])
+    assert code == 0
+    mock_pool.assert_not_called()
+    mock_convert.assert_called_once()
+
+
+def test_main_caps_parallelism_to_available_cpus(tmp_path: Path) -> None:
+    """Test workers x threads per PDF is capped at the available CPU count."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        (input_dir / name).write_bytes(b"%PDF-1.4\n%EOF\n")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output")]
+    with (
+        mock.patch("src.main.available_cpus", return_value=2),
+        mock.patch("src.main.ProcessPoolExecutor", ThreadPoolExecutor),
+        mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert,
+    ):
+        assert main_mod.main([*args, "--workers", "2", "--threads-per-pdf", "4"]) == 0
+    assert {call.kwargs["thread_count"] for call in mock_convert.call_args_list} == {1}
+
+
+def test_main_follows_symlinked_pdfs(tmp_path: Path) -> None:
+    """Test symlinks to PDF files are converted, while dangling ones are skipped."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    target = tmp_path / "elsewhere.pdf"
+    target.write_bytes(b"%PDF-1.4\n%EOF\n")
+    (input_dir / "linked.pdf").symlink_to(target)
+    (input_dir / "dangling.pdf").symlink_to(tmp_path / "missing.pdf")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output"), "--workers", "1"]
+    with mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert:
+        assert main_mod.main(args) == 0
+    assert [call.args[0].name for call in mock_convert.call_args_list] == ["linked.pdf"]
+
+
+def test_main_fails_pdfs_with_clashing_stems(tmp_path: Path) -> None:
+    """Test PDFs whose names differ only in the suffix's case are not converted onto each other's pages."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.pdf", "a.PDF", "b.pdf"):
+        (input_dir / name).write_bytes(b"%PDF-1.4\n%EOF\n")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output"), "--workers", "1"]
+    with mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert:
+        assert main_mod.main(args) == 1
+    assert [call.args[0].name for call in mock_convert.call_args_list] == ["b.pdf"]
+
+
+def test_main_derives_threads_after_clamping_workers(tmp_path: Path) -> None:
+    """Test the default threads per PDF uses every CPU when there are fewer PDFs than workers."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.pdf").write_bytes(b"%PDF-1.4\n%EOF\n")
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output"), "--workers", "4"]
+    with (
+        mock.patch("src.main.available_cpus", return_value=8),
+        mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert,
+    ):
+        assert main_mod.main(args) == 0
+    assert mock_convert.call_args.kwargs["thread_count"] == 8
+
+
+def test_main_finds_pdfs_case_insensitively(tmp_path: Path) -> None:
+    """Test upper-case .PDF files are converted and non-PDF entries are ignored."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("b.PDF", "a.pdf", "notes.txt"):
+        (input_dir / name).write_bytes(b"%PDF-1.4\n%EOF\n")
+    (input_dir / "folder.pdf").mkdir()
+    args = ["--input-dir", str(input_dir), "--output-dir", str(tmp_path / "output"), "--workers", "1"]
+    with mock.patch("src.main.pdf_to_pngs", return_value=[]) as mock_convert:
+        assert main_mod.main(args) == 0
+    assert [call.args[0].name for call in mock_convert.call_args_list] == ["a.pdf", "b.PDF"]
+
+
+def test_helper_modules_have_one_import_identity() -> None:
+    """Test helpers are imported relative to the src package, so patching src.<module> reaches main."""
+    assert main_mod.available_cpus is options_mod.available_cpus
+    assert not {"options", "page_output", "render_ahead", "cache_markers", "log_setup"} & set(sys.modules)
@@ -0,0 +1,83 @@
+"""Unit tests for the command-line options of the converter."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.options as options_mod
+
+
+def test_parse_args_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test parse_args uses default directories when not specified."""
+    test_args = ["main.py"]
+    monkeypatch.setattr(sys, "argv", test_args)
+    args = options_mod.parse_args()
+    assert args.input_dir.name == "data"
+    assert args.output_dir.name == "output"
+
+
+def test_parse_args_prefetch() -> None:
+    """Test --prefetch defaults to DEFAULT_PREFETCH and accepts 0 but not negative values."""
+    assert options_mod.parse_args([]).prefetch == options_mod.DEFAULT_PREFETCH
+    assert options_mod.parse_args(["--prefetch", "0"]).prefetch == 0
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--prefetch", "-1"])
+
+
+def test_parse_args_png_compress_level() -> None:
+    """Test --png-compress-level defaults to poppler output and only accepts zlib levels."""
+    assert options_mod.parse_args([]).png_compress_level is None
+    assert options_mod.parse_args(["--png-compress-level", "3"]).png_compress_level == 3
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--png-compress-level", "10"])
+
+
+def test_parse_args_format() -> None:
+    """Test --format defaults to PNG and rejects PNG-only options with JPEG."""
+    assert options_mod.parse_args([]).format == "png"
+    assert options_mod.parse_args(["--format", "jpeg"]).format == "jpeg"
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--format", "jpeg", "--fast"])
+
+
+def test_parse_args_fast() -> None:
+    """Test --fast selects uncompressed PNG output."""
+    assert options_mod.parse_args(["--fast"]).png_compress_level == 0
+
+
+def test_parse_args_window() -> None:
+    """Test --window defaults to None (derived from the thread count) and must be positive."""
+    assert options_mod.parse_args([]).window is None
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--window", "0"])
+
+
+def test_parse_args_rejects_non_positive_workers() -> None:
+    """Test --workers must be a positive integer."""
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--workers", "0"])
+    with pytest.raises(SystemExit):
+        options_mod.parse_args(["--workers", "many"])
+
+
+def test_available_cpus_honours_affinity_and_quota(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the usable CPU count is limited by the affinity mask and the cgroup quota."""
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(options_mod, "CGROUP_CPU_MAX", cpu_max)
+    monkeypatch.setattr(options_mod.os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+    assert options_mod.available_cpus() == 4
+    cpu_max.write_text("max 100000\n")
+    assert options_mod.available_cpus() == 4
+    cpu_max.write_text("200000 100000\n")
+    assert options_mod.available_cpus() == 2
+    cpu_max.write_text("50000 100000\n")
+    assert options_mod.available_cpus() == 1
+
+
+def test_available_cpus_without_affinity(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test platforms without sched_getaffinity fall back to os.cpu_count."""
+    monkeypatch.setattr(options_mod, "CGROUP_CPU_MAX", tmp_path / "missing")
+    monkeypatch.delattr(options_mod.os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(options_mod.os, "cpu_count", lambda: 6)
+    assert options_mod.available_cpus() == 6
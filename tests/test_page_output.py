@@ -0,0 +1,60 @@
+"""Unit tests for writing rendered pages."""
+
+import errno
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+import src.page_output as page_output_mod
+
+
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA"])
+def test_write_unfiltered_png_round_trips(tmp_path: Path, mode: str) -> None:
+    """Test the unfiltered PNG writer produces files Pillow decodes to the original pixels."""
+    image = Image.effect_noise((37, 11), 60).convert(mode)
+    path = tmp_path / "page.png"
+    page_output_mod.write_unfiltered_png(image, path, 1)
+    with Image.open(path) as decoded:
+        assert decoded.mode == mode
+        assert decoded.tobytes() == image.tobytes()
+
+
+def test_write_unfiltered_png_other_modes_use_pillow(tmp_path: Path) -> None:
+    """Test modes without a direct PNG mapping fall back to Pillow's encoder."""
+    image = Image.new("1", (8, 8), 1)
+    path = tmp_path / "page.png"
+    page_output_mod.write_unfiltered_png(image, path, None)
+    with Image.open(path) as decoded:
+        assert decoded.tobytes() == image.tobytes()
+
+
+@pytest.mark.parametrize("level", [6, 9])
+def test_write_unfiltered_png_high_levels_use_pillow(tmp_path: Path, level: int) -> None:
+    """Test levels above the unfiltered maximum are saved with Pillow's filtering encoder for smaller files."""
+    image = Image.new("L", (8, 8), 255)
+    with mock.patch.object(image, "save") as save:
+        page_output_mod.write_unfiltered_png(image, tmp_path / "page.png", level)
+    save.assert_called_once_with(tmp_path / "page.png", "PNG", compress_level=level, optimize=False)
+
+
+def test_save_page_removes_partial_copy_on_failure(tmp_path: Path) -> None:
+    """Test a cross-device copy that fails part-way leaves no .partial file in the output directory."""
+    page = tmp_path / "rendered.png"
+    page.write_bytes(b"page 1")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    def copyfile(src: str, dst: Path) -> None:
+        Path(dst).write_bytes(b"pa")
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    with (
+        mock.patch("src.page_output.os.replace", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")),
+        mock.patch("src.page_output.shutil.copyfile", side_effect=copyfile),
+        pytest.raises(OSError, match="No space left"),
+    ):
+        page_output_mod.save_page(str(page), output_dir / "a_page_1.png", tmp_path, None)
+    assert not list(output_dir.iterdir())
+    assert page.exists()
@@ -0,0 +1,44 @@
+"""Unit tests for rendering page windows ahead of the consumer."""
+
+import threading
+
+import pytest
+
+import src.render_ahead as render_ahead_mod
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_render_ahead_yields_in_order(prefetch: int) -> None:
+    """Test rendered ranges come back in order whether or not they are rendered ahead."""
+    ranges = [(1, 2), (3, 4), (5, 5)]
+    rendered = render_ahead_mod.render_ahead(lambda first, last: list(range(first, last + 1)), ranges, prefetch)
+    assert list(rendered) == [[1, 2], [3, 4], [5]]
+
+
+def test_render_ahead_reraises_render_errors() -> None:
+    """Test an error raised on the render thread surfaces in the consumer after earlier results."""
+
+    def render(first: int, last: int) -> int:
+        if first == 2:
+            raise RuntimeError("bad page")
+        return first
+
+    rendered = render_ahead_mod.render_ahead(render, [(1, 1), (2, 2), (3, 3)], 2)
+    assert next(rendered) == 1
+    with pytest.raises(RuntimeError, match="bad page"):
+        next(rendered)
+
+
+def test_render_ahead_close_stops_rendering() -> None:
+    """Test closing early stops the render thread once its bounded look-ahead is full."""
+    calls: list[int] = []
+
+    def render(first: int, last: int) -> int:
+        calls.append(first)
+        return first
+
+    rendered = render_ahead_mod.render_ahead(render, [(page, page) for page in range(1, 51)], 1)
+    assert next(rendered) == 1
+    rendered.close()
+    assert not any(thread.name == "pdf-render" for thread in threading.enumerate())
+    assert len(calls) <= 4